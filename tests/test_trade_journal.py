@@ -0,0 +1,96 @@
+"""
+Check that the optional pyarrow reader gives the same results as the C parser,
+and that malformed rows are handled the way pandas' skipna aggregations would.
+"""
+
+import importlib.util
+from pathlib import Path
+
+import matplotlib
+import pandas as pd
+import pytest
+
+matplotlib.use('Agg')
+
+import trade_journal  # noqa: E402
+
+BUNDLED_CSV = Path(__file__).resolve().parent.parent / 'Trades.csv'
+
+# Blank P&L, formatted P&L, blank Symbol, blank Exit Time, and a June trade with a
+# single-digit AM hour to check the timestamp format across month names.
+MALFORMED_ROWS = [
+    'EURUSD,Buy,"May 16, 2024 9:00 AM",1.0850,"May 16, 2024 11:00 AM",1.0870,1.0840,20,40.0,',
+    'GBPUSD,Sell,"May 16, 2024 1:00 PM",1.2650,"May 16, 2024 2:30 PM",1.2620,1.2660,10,20.0,"$1,234.50"',
+    ',Buy,"May 17, 2024 9:00 AM",1.0850,"May 17, 2024 10:00 AM",1.0860,1.0840,20,40.0,200.0',
+    'EURUSD,Sell,"May 17, 2024 3:00 PM",1.0870,,1.0860,1.0880,20,40.0,-150.0',
+    'EURUSD,Buy,"Jun 3, 2024 1:05 AM",1.0850,"Jun 3, 2024 1:21 AM",1.0860,1.0840,20,40.0,50.0',
+]
+
+needs_pyarrow = pytest.mark.skipif(
+    importlib.util.find_spec('pyarrow') is None, reason='pyarrow not installed'
+)
+
+
+@pytest.fixture
+def trades_csv(tmp_path):
+    path = tmp_path / 'Trades.csv'
+    path.write_text(BUNDLED_CSV.read_text().rstrip('\n') + '\n' + '\n'.join(MALFORMED_ROWS) + '\n')
+    return str(path)
+
+
+def _results(csv_path, capsys):
+    journal = trade_journal.TradeJournal(csv_path)
+    journal.load_data()
+    capsys.readouterr()
+    journal.print_stats()
+    return {
+        'stats': capsys.readouterr().out,
+        'sizes': journal.trade_size_summary(),
+        'monthly': journal.monthly_performance_summary(),
+        'days': journal.best_performing_days(),
+        'pairs': journal.most_profitable_pairs(),
+    }
+
+
+def _assert_same(expected, actual):
+    assert expected['stats'] == actual['stats']
+    pd.testing.assert_frame_equal(expected['sizes'], actual['sizes'])
+    pd.testing.assert_frame_equal(expected['monthly'], actual['monthly'])
+    pd.testing.assert_series_equal(expected['days'], actual['days'])
+    pd.testing.assert_series_equal(expected['pairs'], actual['pairs'])
+
+
+@needs_pyarrow
+def test_pyarrow_and_c_readers_agree(trades_csv, capsys, monkeypatch):
+    monkeypatch.setattr(trade_journal, '_HAS_PYARROW', False)
+    c_parser = _results(trades_csv, capsys)
+    monkeypatch.setattr(trade_journal, '_HAS_PYARROW', True)
+    pyarrow_reader = _results(trades_csv, capsys)
+    _assert_same(c_parser, pyarrow_reader)
+
+
+def test_malformed_rows_are_skipped_like_pandas(trades_csv, capsys):
+    results = _results(trades_csv, capsys)
+    assert 'Total P&L: $11327.53' in results['stats']
+    assert 'Losing trades: 16' in results['stats']
+    # The dated rows land in May; the row without an exit time is dropped.
+    assert results['monthly'].loc['2024-05', 'Trades_Count'] == 25
+    assert results['monthly'].loc['2024-06', 'Total_PnL'] == pytest.approx(50.0)
+    assert results['days'].index[0].isoformat() == '2024-05-15'
+    assert results['pairs'].to_dict() == pytest.approx({'EURUSD': 5850.71, 'GBPUSD': 5276.82})
+
+
+def test_streamed_totals_match_loaded_data(trades_csv, capsys):
+    loaded = trade_journal.TradeJournal(trades_csv)
+    loaded.load_data()
+    streamed = trade_journal.TradeJournal(trades_csv)
+    streamed.load_and_aggregate(chunksize=4)
+
+    loaded.print_stats()
+    loaded_stats = capsys.readouterr().out
+    streamed.print_stats()
+    assert capsys.readouterr().out == loaded_stats
+    pd.testing.assert_series_equal(loaded.monthly_total_pnl(), streamed.monthly_total_pnl())
+    pd.testing.assert_series_equal(
+        loaded.most_profitable_pairs(), streamed.most_profitable_pairs(), check_index_type=False
+    )
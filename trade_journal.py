@@ -9,9 +9,88 @@ Date: 09/06/2025
 """
 
 from __future__ import annotations
+import functools
+from collections import defaultdict
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from typing import Optional
+from typing import Callable, DefaultDict, Optional, TypeVar
+
+try:
+    import pyarrow  # noqa: F401
+    _HAS_PYARROW = True
+except ImportError:  # pyarrow is optional; the default C parser is used instead.
+    _HAS_PYARROW = False
+
+_T = TypeVar('_T')
+
+# Strips currency symbols and thousands separators from P&L strings in one pass.
+_PNL_TRANS = str.maketrans('', '', '$,')
+_DATE_COLUMNS = ['Entry Time', 'Exit Time']
+# Layout of the broker export; tried first because format inference falls back to
+# slow per-cell dateutil parsing on it. Other layouts are handled by _ensure_datetimes.
+_DATE_FORMAT = '%b %d, %Y %I:%M %p'
+# P&L is deliberately left as float64: float32 cannot hold cents exactly and the
+# drift shows up in the printed totals.
+_COLUMN_DTYPES = {'Symbol': 'category', 'Size': 'float32'}
+# _ExitDay value for trades without an exit time.
+_NO_DAY = np.iinfo(np.int32).min
+
+
+def _parse_pnl(value: object) -> float:
+    """Convert a raw P&L cell such as '$1,234.50' to a float; blanks become NaN."""
+    if not isinstance(value, str):
+        return np.nan
+    cleaned = value.translate(_PNL_TRANS)
+    return float(cleaned) if cleaned else np.nan
+
+
+def _ensure_datetimes(df: pd.DataFrame, columns: list[str]) -> None:
+    """
+    Convert any columns read_csv left as text to datetimes. This covers files
+    whose timestamps do not match _DATE_FORMAT, and header-only files.
+    """
+    for column in columns:
+        if not pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = pd.to_datetime(df[column], format='mixed')
+
+
+def _month_codes(exit_time: pd.Series) -> np.ndarray:
+    """
+    Months since year 0 as an integer key, so monthly grouping avoids PeriodIndex.
+    Missing exit times get -1 and are left out of monthly aggregates.
+    """
+    valid = exit_time.notna().to_numpy()
+    codes = np.full(valid.size, -1, dtype=np.int32)
+    dt = exit_time[valid].dt
+    codes[valid] = dt.year.to_numpy(np.int32) * 12 + dt.month.to_numpy(np.int32) - 1
+    return codes
+
+
+def _requires_data(method: Callable[..., _T]) -> Callable[..., _T]:
+    """Raise ValueError if a TradeJournal method is called before load_data."""
+    @functools.wraps(method)
+    def wrapper(self: TradeJournal, *args, **kwargs) -> _T:
+        if self.df is None:
+            raise ValueError("Data not loaded yet.")
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _requires_data_or_totals(method: Callable[..., _T]) -> Callable[..., _T]:
+    """Like _requires_data, but also accepts totals from load_and_aggregate."""
+    @functools.wraps(method)
+    def wrapper(self: TradeJournal, *args, **kwargs) -> _T:
+        if self.df is None and not self._has_totals:
+            raise ValueError("Data not loaded yet.")
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _month_labels(codes: np.ndarray) -> pd.Index:
+    """Turn month codes from _month_codes back into 'YYYY-MM' labels."""
+    years, months = np.divmod(np.asarray(codes, dtype=np.int64), 12)
+    return pd.Index([f"{y:04d}-{m + 1:02d}" for y, m in zip(years, months)], name='Exit Time')
 
 
 class TradeJournal:
@@ -22,40 +101,141 @@ class TradeJournal:
     def __init__(self, csv_path: str) -> None:
         self.csv_path = csv_path
         self.df: Optional[pd.DataFrame] = None
+        self._monthly: Optional[pd.DataFrame] = None
+        self._reset_totals()
+
+    def _reset_totals(self) -> None:
+        """Clear the running totals kept by load_and_aggregate."""
+        self._has_totals = False
+        self._sum = 0.0
+        self._n = 0
+        self._priced = 0
+        self._wins = 0
+        self._losses = 0
+        self._month_sums: DefaultDict[int, float] = defaultdict(float)
+        self._sym_sums: DefaultDict[str, float] = defaultdict(float)
 
     def load_data(self) -> None:
-        """Load and clean trade data from CSV."""
-        df = pd.read_csv(self.csv_path)
-        df['Entry Time'] = pd.to_datetime(df['Entry Time'])
-        df['Exit Time'] = pd.to_datetime(df['Exit Time'])
-        df['P&L'] = (
-            df['P&L']
-            .astype(str)
-            .str.replace('$', '', regex=False)
-            .str.replace(',', '', regex=False)
-            .astype(float)
-        )
+        """Load and clean trade data from CSV, ordered by exit time."""
+        if _HAS_PYARROW:
+            # Arrow's multithreaded reader does not accept converters, so P&L is
+            # read as text and cleaned in a single pass afterwards.
+            df = pd.read_csv(
+                self.csv_path,
+                engine='pyarrow',
+                parse_dates=_DATE_COLUMNS,
+                date_format=_DATE_FORMAT,
+                dtype={**_COLUMN_DTYPES, 'P&L': 'str'},
+            )
+            df['P&L'] = np.fromiter(
+                (_parse_pnl(s) for s in df['P&L'].astype(str).to_numpy()),
+                dtype=np.float64,
+                count=len(df),
+            )
+        else:
+            df = pd.read_csv(
+                self.csv_path,
+                converters={'P&L': _parse_pnl},
+                parse_dates=_DATE_COLUMNS,
+                date_format=_DATE_FORMAT,
+                cache_dates=True,
+                dtype=_COLUMN_DTYPES,
+            )
+            # The converter never runs on a header-only file, leaving an object column.
+            df['P&L'] = df['P&L'].astype(np.float64)
+        _ensure_datetimes(df, _DATE_COLUMNS)
+        df.sort_values('Exit Time', inplace=True, kind='stable')
+        df.reset_index(drop=True, inplace=True)
+        # Parsed as float first so the categories keep numeric ordering.
+        df['Size'] = df['Size'].astype('category')
+        # Helper columns are underscore-prefixed and hidden from the printed summary.
+        df['_YM'] = _month_codes(df['Exit Time'])
+        # Days since the Unix epoch, the integer key for daily grouping.
+        exit_days = df['Exit Time'].to_numpy().astype('datetime64[D]')
+        df['_ExitDay'] = np.where(np.isnat(exit_days), _NO_DAY, exit_days.view('i8')).astype(np.int32)
         self.df = df
+        self._monthly = None
 
+    def load_and_aggregate(self, chunksize: int = 200_000) -> None:
+        """
+        Stream the CSV in chunks and keep only running totals, for journals too
+        large to load with load_data. Until load_data is called, print_stats,
+        monthly_total_pnl and most_profitable_pairs report from these totals.
+        """
+        self._reset_totals()
+        reader = pd.read_csv(
+            self.csv_path,
+            usecols=['Symbol', 'Exit Time', 'P&L'],
+            converters={'P&L': _parse_pnl},
+            parse_dates=['Exit Time'],
+            date_format=_DATE_FORMAT,
+            cache_dates=True,
+            dtype={'Symbol': 'category'},
+            chunksize=chunksize,
+        )
+        for chunk in reader:
+            _ensure_datetimes(chunk, ['Exit Time'])
+            raw_pnl = chunk['P&L'].to_numpy(np.float64)
+            self._n += raw_pnl.size
+            self._priced += int(np.count_nonzero(~np.isnan(raw_pnl)))
+            self._wins += int(np.count_nonzero(raw_pnl > 0))
+            self._losses += int(np.count_nonzero(raw_pnl <= 0))
+            # NaN P&L is treated as zero, matching pandas' skipna sums.
+            pnl = np.nan_to_num(raw_pnl)
+            self._sum += float(pnl.sum())
+
+            month_codes = _month_codes(chunk['Exit Time'])
+            dated = month_codes >= 0
+            months, month_index = np.unique(month_codes[dated], return_inverse=True)
+            month_totals = np.bincount(month_index, weights=pnl[dated], minlength=months.size)
+            for month, total in zip(months.tolist(), month_totals):
+                self._month_sums[month] += float(total)
+
+            symbols = chunk['Symbol']
+            codes = symbols.cat.codes.to_numpy()
+            # Missing symbols have code -1 and are left out, as in most_profitable_pairs.
+            named = codes >= 0
+            sym_totals = np.bincount(
+                codes[named], weights=pnl[named], minlength=symbols.cat.categories.size
+            )
+            observed = np.bincount(codes[named], minlength=symbols.cat.categories.size) > 0
+            for symbol, total in zip(symbols.cat.categories[observed], sym_totals[observed]):
+                self._sym_sums[symbol] += float(total)
+        self._has_totals = True
+
+    @_requires_data
     def print_summary(self) -> None:
-        """Print info and missing values summary."""
-        if self.df is None:
-            raise ValueError("Data not loaded yet.")
-        print(self.df.info())
-        print(self.df.head())
+        """Print column types, the first rows and columns with missing values."""
+        df = self.df
+        trades = df.loc[:, ~df.columns.str.startswith('_')]
+        print(f"{len(trades)} trades, {trades.shape[1]} columns")
+        print(trades.dtypes)
+        print(trades.head())
+        missing = len(trades) - trades.count()
+        missing = missing[missing > 0]
         print("\nMissing values per column:")
-        print(self.df.isnull().sum())
+        print(missing if not missing.empty else "None")
 
+    @_requires_data_or_totals
     def print_stats(self) -> None:
         """Calculate and print overall trade stats."""
-        if self.df is None:
-            raise ValueError("Data not loaded yet.")
-        total_trades = len(self.df)
-        winning_trades = len(self.df[self.df["P&L"] > 0])
-        losing_trades = len(self.df[self.df["P&L"] <= 0])
+        df = self.df
+        if df is not None:
+            pnl = df["P&L"].to_numpy()
+            total_trades = pnl.size
+            winning_trades = int(np.count_nonzero(pnl > 0))
+            losing_trades = int(np.count_nonzero(pnl <= 0))
+            # Missing P&L values are skipped, as pandas' sum and mean would.
+            total_pnl = np.nansum(pnl)
+            valid_trades = int(np.count_nonzero(~np.isnan(pnl)))
+        else:
+            total_trades = self._n
+            winning_trades = self._wins
+            losing_trades = self._losses
+            total_pnl = self._sum
+            valid_trades = self._priced
         win_rate = (winning_trades / total_trades) * 100 if total_trades else 0.0
-        total_pnl = self.df["P&L"].sum()
-        avg_pnl = self.df["P&L"].mean()
+        avg_pnl = total_pnl / valid_trades if valid_trades else float("nan")
 
         print(f"Total trades: {total_trades}")
         print(f"Winning trades: {winning_trades}")
@@ -64,15 +244,18 @@ class TradeJournal:
         print(f"Total P&L: ${total_pnl:.2f}")
         print(f"Average P&L per trade: ${avg_pnl:.2f}")
 
+    @_requires_data
     def plot_cumulative_pnl(self) -> None:
         """Plot cumulative profit/loss over time."""
-        if self.df is None:
-            raise ValueError("Data not loaded yet.")
-        df_sorted = self.df.sort_values("Exit Time")
-        df_sorted["Cumulative P&L"] = df_sorted["P&L"].cumsum()
+        df = self.df
+        exit_times = df["Exit Time"].to_numpy()
+        # nancumsum skips missing P&L, as pandas' cumsum did, instead of ending the line.
+        cumulative_pnl = np.nancumsum(df["P&L"].to_numpy())
 
         plt.figure(figsize=(10, 6))
-        plt.plot(df_sorted["Exit Time"], df_sorted["Cumulative P&L"], marker="o", linestyle="-")
+        # Draw at most ~500 markers so rendering stays fast on long journals.
+        mark_every = max(1, cumulative_pnl.size // 500)
+        plt.plot(exit_times, cumulative_pnl, marker="o", markevery=mark_every, linestyle="-")
         plt.title("Cumulative P&L Over Time")
         plt.xlabel("Exit Time")
         plt.ylabel("Cumulative P&L ($)")
@@ -80,33 +263,69 @@ class TradeJournal:
         plt.tight_layout()
         plt.show()
 
+    @_requires_data
     def trade_size_summary(self) -> pd.DataFrame:
-        """Return trade size impact summary."""
-        if self.df is None:
-            raise ValueError("Data not loaded yet.")
-        return self.df.groupby('Size').agg(
+        """Return trade size impact summary, indexed by size."""
+        df = self.df
+        return df.groupby('Size', observed=True).agg(
             Average_PnL=('P&L', 'mean'),
             Total_Trades=('P&L', 'count')
-        ).reset_index()
+        )
 
+    @_requires_data
     def monthly_performance_summary(self) -> pd.DataFrame:
-        """Return monthly performance summary."""
-        if self.df is None:
-            raise ValueError("Data not loaded yet.")
-        monthly_summary = self.df.groupby(self.df['Exit Time'].dt.to_period('M')).agg(
-            Total_PnL=('P&L', 'sum'),
-            Average_PnL=('P&L', 'mean'),
-            Trades_Count=('P&L', 'count'),
-            Win_Rate=('P&L', lambda x: (x > 0).mean() * 100)
-        ).reset_index()
-        monthly_summary['Exit Time'] = monthly_summary['Exit Time'].dt.strftime('%Y-%m')
+        """Return monthly performance summary indexed by month, computed once per load."""
+        # A copy, so callers editing the result cannot corrupt the cache.
+        return self._monthly_summary().copy()
+
+    def _monthly_summary(self) -> pd.DataFrame:
+        """Build or return the cached monthly summary; callers must not modify it."""
+        if self._monthly is not None:
+            return self._monthly
+        df = self.df
+        month_codes = df['_YM'].to_numpy()
+        # Rows without an exit time are dropped, as a groupby on the month would.
+        dated = month_codes >= 0
+        month_codes = month_codes[dated]
+        pnl = df['P&L'].to_numpy(np.float64)[dated]
+        codes, month_index = np.unique(month_codes, return_inverse=True)
+        valid = ~np.isnan(pnl)
+        totals = np.bincount(month_index, weights=np.where(valid, pnl, 0.0), minlength=codes.size)
+        counts = np.bincount(month_index[valid], minlength=codes.size)
+        rows = np.bincount(month_index, minlength=codes.size)
+        wins = np.bincount(month_index[pnl > 0], minlength=codes.size)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = totals / counts
+        monthly_summary = pd.DataFrame({
+            '_YM': codes,
+            'Total_PnL': totals,
+            'Average_PnL': means,
+            'Trades_Count': counts.astype(np.int64),
+            'Win_Rate': wins / rows * 100,
+        })
+        monthly_summary.index = _month_labels(monthly_summary.pop('_YM').to_numpy())
+        self._monthly = monthly_summary
         return monthly_summary
 
+    @_requires_data_or_totals
+    def monthly_total_pnl(self) -> pd.Series:
+        """Return total P&L per month, indexed by 'YYYY-MM'."""
+        if self.df is not None:
+            return self._monthly_summary()['Total_PnL'].copy()
+        months = sorted(self._month_sums)
+        return pd.Series(
+            [self._month_sums[m] for m in months],
+            index=_month_labels(months),
+            name='Total_PnL',
+            dtype=np.float64,
+        )
+
+    @_requires_data
     def plot_monthly_pnl(self) -> None:
         """Plot monthly total P&L."""
-        monthly_summary = self.monthly_performance_summary()
+        monthly_summary = self._monthly_summary()
         plt.figure(figsize=(10, 6))
-        plt.bar(monthly_summary['Exit Time'], monthly_summary['Total_PnL'], color='skyblue')
+        plt.bar(monthly_summary.index.astype(str), monthly_summary['Total_PnL'], color='skyblue')
         plt.title('Monthly Total P&L')
         plt.xlabel('Month')
         plt.ylabel('Total P&L ($)')
@@ -114,19 +333,62 @@ class TradeJournal:
         plt.tight_layout()
         plt.show()
 
+    @_requires_data
     def best_performing_days(self, top_n: int = 5) -> pd.Series:
         """Return top N best performing days by P&L."""
-        if self.df is None:
-            raise ValueError("Data not loaded yet.")
-        self.df['Exit Date'] = self.df['Exit Time'].dt.date
-        daily_performance = self.df.groupby('Exit Date')['P&L'].sum().sort_values(ascending=False)
-        return daily_performance.head(top_n)
+        df = self.df
+        # Trades are sorted by exit time, so each day is a contiguous run of rows.
+        days = df['_ExitDay'].to_numpy()
+        pnl = df['P&L'].to_numpy()
+        # Trades without an exit time are dropped, as groupby would.
+        dated = days != _NO_DAY
+        days, pnl = days[dated], pnl[dated]
+        if days.size == 0:
+            return pd.Series(dtype=pnl.dtype, name='P&L', index=pd.Index([], name='Exit Date'))
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(days)) + 1))
+        # NaN P&L is zeroed so one missing value does not blank the whole day.
+        daily_sums = np.add.reduceat(np.where(np.isnan(pnl), 0.0, pnl), starts)
+        day_keys = days[starts]
+        top_n = max(0, min(top_n, daily_sums.size))
+        # Partial selection of the top N, then sort only those N.
+        if top_n < daily_sums.size:
+            top_idx = np.argpartition(-daily_sums, top_n)[:top_n]
+        else:
+            top_idx = np.arange(daily_sums.size)
+        top_idx = top_idx[np.argsort(-daily_sums[top_idx], kind='stable')]
+        # Only the surviving day keys are converted back to dates.
+        return pd.Series(
+            daily_sums[top_idx],
+            index=pd.Index(pd.to_datetime(day_keys[top_idx], unit='D').date, name='Exit Date'),
+            name='P&L',
+        )
 
-    def most_profitable_pairs(self) -> pd.Series:
-        """Return currency pairs ranked by total P&L."""
-        if self.df is None:
-            raise ValueError("Data not loaded yet.")
-        return self.df.groupby('Symbol')['P&L'].sum().sort_values(ascending=False)
+    @_requires_data_or_totals
+    def most_profitable_pairs(self, top_n: Optional[int] = None) -> pd.Series:
+        """Return currency pairs ranked by total P&L, optionally only the top N."""
+        df = self.df
+        if df is None:
+            names = list(self._sym_sums)
+            totals = np.fromiter(self._sym_sums.values(), dtype=np.float64, count=len(names))
+        else:
+            symbols = df['Symbol']
+            codes = symbols.cat.codes.to_numpy()
+            pnl = df['P&L'].to_numpy(np.float64)
+            # Missing symbols have code -1 and NaN P&L is skipped, as groupby-sum would.
+            keep = (codes >= 0) & ~np.isnan(pnl)
+            n_categories = symbols.cat.categories.size
+            totals = np.bincount(codes[keep], weights=pnl[keep], minlength=n_categories)
+            observed = np.bincount(codes[codes >= 0], minlength=n_categories) > 0
+            names, totals = symbols.cat.categories[observed], totals[observed]
+        pair_totals = pd.Series(
+            totals,
+            index=pd.Index(names, name='Symbol'),
+            name='P&L',
+            dtype=np.float64,
+        )
+        if top_n is not None:
+            return pair_totals.nlargest(top_n)
+        return pair_totals.sort_values(ascending=False)
 
 
 def main() -> None: